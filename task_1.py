@@ -5,46 +5,78 @@
 
 """
 Програма моделює логістичну мережу «термінали → склади → магазини» і
-обчислює максимальний потік за алгоритмом Едмондса–Карпа.
+обчислює максимальний потік за алгоритмом Дініца (реалізацію Едмондса–Карпа
+збережено в MaxFlow.edmonds_karp для порівняння).
 
 - Побудова графа відповідає структурі зі скрінів (2 термінали, 4 склади, 14 магазинів).
-- Розкладка підсумкового потоку по парах «Термінал → Магазин» робиться
-  пропорційно внеску кожного термінала у вхід потоку конкретного складу.
+- Розкладка підсумкового потоку по парах «Термінал → Магазин» — точна
+  цілочисельна декомпозиція потоку на шляхи SRC → T → S → M → SNK.
 - Результати зберігаються у CSV та короткому README.
 """
 
 from __future__ import annotations
 
-from collections import deque, defaultdict
+from array import array
 from dataclasses import dataclass
-from typing import Dict, Tuple, Iterable, List
+from itertools import chain
+from typing import Callable, Dict, Tuple, Iterable, List, Sequence
 import csv
 
 
 # ---------------------------------------------------------------------------
-# Алгоритм максимального потоку (Едмондс–Карп)
+# Алгоритми максимального потоку (Едмондс–Карп, Дініц)
 # ---------------------------------------------------------------------------
 
+_UNSEEN = -1   # вершину ще не досягнуто пошуком
+_ROOT = -2     # вершина, з якої стартує пошук
+
+# ємності зберігаються як 32-бітні цілі (array("i")), тож більшої ємності ребра бути не може
+_CAP_MAX = 2**31 - 1
+
+
 @dataclass
-class _PathResult:
-    """Результат пошуку доповнювального шляху."""
-    bottleneck: int                  # мінімальна залишкова ємність на шляху
-    parent: Dict[str, str | None]    # «батько» кожної вершини в BFS-дереві
+class EdgeFlows:
+    """
+    Фактичні потоки у вигляді паралельних масивів («структура масивів»):
+    k-те ребро мережі — src[k]→dst[k] з потоком flow[k] (номери вершин — індекси в names).
+    """
+    names: List[str]
+    src: array
+    dst: array
+    flow: array
 
 
 class MaxFlow:
     """
-    Проста реалізація алгоритму Едмондса–Карпа.
+    Реалізація алгоритмів Едмондса–Карпа та Дініца над спільним графом.
 
-    graph[u][v] = C означає орієнтоване ребро u→v з ємністю C.
-    Внутрішньо зберігаємо лише прямі ребра (зворотні додаються при ініціалізації
-    резидуального графа).
+    Вершини отримують цілі номери ще під час додавання ребер, а самі ребра
+    накопичуються в паралельних масивах: k-те ребро — _edge_src[k]→_edge_dst[k]
+    з ємністю _edge_cap[k]. Перед розрахунком граф «компілюється» у CSR-масиви
+    (див. _compile), де кожне ребро зберігається парою «пряме/зворотне» з номерами
+    e та e ^ 1, тож BFS працює лише з цілими числами.
     """
 
     def __init__(self) -> None:
-        # словник словників: вихідні ребра з ємностями
-        self.graph: Dict[str, Dict[str, int]] = defaultdict(dict)
-        self.nodes: set[str] = set()
+        self._ids: Dict[str, int] = {}      # ім'я вершини -> номер
+        self._names: List[str] = []         # номер -> ім'я вершини
+
+        # вхідні ребра мережі
+        self._edge_src = array("i")
+        self._edge_dst = array("i")
+        self._edge_cap = array("i")
+        self._edge_index: Dict[int, int] = {}  # (u << 32) | v -> номер ребра k
+
+        # CSR-представлення (заповнюється в _compile)
+        self._indptr = array("i")           # межі списків суміжності в _adj
+        self._adj = array("i")              # номери ребер, згруповані за початком
+        self._head = array("i")             # кінець ребра e
+        self._cap = array("i")              # залишкова ємність ребра e (змінюється на місці)
+        self._cap0 = array("i")             # початкові ємності для скидання перед новим розрахунком
+        self._flow = array("i")             # потік по k-му ребру мережі (накопичується в _push)
+        self._no_flow = array("i")          # шаблон нулів для скидання _flow
+        self._compiled = False              # чи відповідають CSR-масиви поточним ребрам
+        self._unseen = array("i")           # шаблон [-1] * n для скидання буферів BFS
 
     # побудова графа
 
@@ -53,120 +85,447 @@ class MaxFlow:
         Додає/накопичує ребро u→v з ємністю c.
         Якщо ребро вже існує — ємність підсумовується (зручно для агрегацій).
         """
-        if c < 0:
-            raise ValueError("Ємність ребра повинна бути невід'ємною")
-
-        self.nodes.add(u)
-        self.nodes.add(v)
+        self.add_edges(((u, v, c),))
 
-        # додається/накопичуться пряма ємність
-        self.graph[u][v] = self.graph[u].get(v, 0) + c
-
-        # гарантується наявність запису для v у self.graph (щоб ітерації були простіші)
-        self.graph.setdefault(v, self.graph.get(v, {}))
+    def add_edges(self, edges: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        Пакетно додає ребра (u, v, c) за один прохід.
+        Імена вершин одразу переводяться в цілі номери, а повторне ребро u→v
+        знаходиться за ключем (u << 32) | v і підсумовує ємність.
+        """
+        ids, names = self._ids, self._names
+        src, dst, caps, index = self._edge_src, self._edge_dst, self._edge_cap, self._edge_index
+        self._compiled = False
+
+        for u, v, c in edges:
+            if c < 0:
+                raise ValueError("Ємність ребра повинна бути невід'ємною")
+            if c > _CAP_MAX:
+                raise ValueError(f"Ємність ребра не може перевищувати {_CAP_MAX}")
+
+            ui = ids.get(u)
+            if ui is None:
+                ui = ids[u] = len(names)
+                names.append(u)
+            vi = ids.get(v)
+            if vi is None:
+                vi = ids[v] = len(names)
+                names.append(v)
+
+            key = (ui << 32) | vi
+            k = index.get(key)
+            if k is None:
+                index[key] = len(caps)
+                src.append(ui)
+                dst.append(vi)
+                caps.append(c)
+            else:
+                if caps[k] + c > _CAP_MAX:
+                    raise ValueError(f"Сумарна ємність ребра {u}→{v} перевищує {_CAP_MAX}")
+                caps[k] += c
 
     # обчислення maxflow
 
-    def _build_residual(self) -> Dict[str, Dict[str, int]]:
+    def _compile(self) -> None:
         """
-        Створює резидуальний граф: для кожного прямого ребра u→v з ємністю C
-        додаємо:
-            - залишкову ємність по прямому ребру:  res[u][v] = C
-            - зворотне ребро з нульовою ємністю:  res[v][u] = 0
+        Перетворює масиви ребер на CSR-масиви (резидуальний граф):
+            - ребро 2k     — пряме u→v з ємністю C:   _head[2k] = v,     _cap[2k] = C
+            - ребро 2k + 1 — зворотне v→u з ємністю 0: _head[2k + 1] = u, _cap[2k + 1] = 0
+        Отже, зворотне до ребра e — завжди e ^ 1, а його початок — _head[e ^ 1].
+        Ребра, що виходять з вершини u, лежать у _adj[_indptr[u]:_indptr[u + 1]].
         """
-        res: Dict[str, Dict[str, int]] = {u: dict(vs) for u, vs in self.graph.items()}
-        # додаються зворотні ребра з нульовою ємністю там, де їх немає
-        for u in list(res.keys()):
-            for v in list(res[u].keys()):
-                res.setdefault(v, {}).setdefault(u, 0)
-        return res
-
-    def _bfs_augment(self, res: Dict[str, Dict[str, int]], s: str, t: str) -> _PathResult | None:
+        n = len(self._names)
+        m = len(self._edge_cap)
+
+        head = array("i", bytes(8 * m))
+        head[0::2] = self._edge_dst
+        head[1::2] = self._edge_src
+        cap = array("i", bytes(8 * m))
+        cap[0::2] = self._edge_cap
+
+        degree = [0] * n
+        for u in head:
+            degree[u] += 1
+
+        # префіксні суми ступенів — межі списків суміжності
+        indptr = array("i", [0] * (n + 1))
+        for i in range(n):
+            indptr[i + 1] = indptr[i] + degree[i]
+
+        # розкладаємо номери ребер за їхнім початком
+        adj = array("i", [0] * len(head))
+        fill = list(indptr[:n])
+        for e in range(len(head)):
+            u = head[e ^ 1]
+            adj[fill[u]] = e
+            fill[u] += 1
+
+        self._indptr, self._adj, self._head, self._cap = indptr, adj, head, cap
+        self._cap0 = array("i", cap)
+        self._flow = array("i", bytes(4 * m))
+        self._no_flow = array("i", bytes(4 * m))
+        self._unseen = array("i", [_UNSEEN] * n)
+        self._compiled = True
+
+    def _reset(self) -> None:
+        """
+        Готує резидуальний граф до нового розрахунку. CSR-масиви будуються лише
+        після зміни набору ребер; інакше достатньо повернути початкові ємності
+        (cap[:] = cap0) і обнулити потоки — жодного копіювання графа перед кожним запуском.
+        """
+        if self._compiled:
+            self._cap[:] = self._cap0
+            self._flow[:] = self._no_flow
+        else:
+            self._compile()
+
+    def _push(self, e: int, d: int) -> None:
         """
-        BFS по резидуальному графу для пошуку доповнювального шляху s→t.
-        Повертає _PathResult з «bottleneck» (мінімальна залишкова ємність на шляху).
-        Якщо шляху немає — повертає None.
+        Проштовхує d одиниць по ребру e: оновлює залишкові ємності пари e / e ^ 1
+        і поточний потік ребра мережі e >> 1 (для зворотного ребра — зменшує його).
         """
-        parent: Dict[str, str | None] = {s: None}
-        q: deque[str] = deque([s])
-
-        while q:
-            u = q.popleft()
-            for v, cap in res[u].items():
-                # переходимо лише по позитивній залишковій ємності
-                if v not in parent and cap > 0:
-                    parent[v] = u
-                    if v == t:
-                        # знайшли t — одразу відновлюємо «вузьке місце» (bottleneck)
-                        bottleneck = float("inf")
-                        x = v
-                        while parent[x] is not None:
-                            p = parent[x]  # тип: ignore
-                            bottleneck = min(bottleneck, res[p][x])
-                            x = p
-                        return _PathResult(int(bottleneck), parent)
-                    q.append(v)
-
-        return None
-
-    def edmonds_karp(self, s: str, t: str) -> Tuple[int, Dict[str, Dict[str, int]], Dict[str, Dict[str, int]]]:
+        self._cap[e] -= d
+        self._cap[e ^ 1] += d
+        if e & 1:
+            self._flow[e >> 1] -= d
+        else:
+            self._flow[e >> 1] += d
+
+    def _flows(self) -> EdgeFlows:
+        """
+        Збирає фактичні потоки по ребрах мережі у паралельні масиви.
+        Потоки вже накопичені в _flow під час насичення, тож окремий прохід
+        «початкова ємність – залишкова» не потрібен.
+        """
+        head = self._head
+        return EdgeFlows(
+            names=list(self._names),
+            src=head[1::2],
+            dst=head[0::2],
+            flow=array("i", self._flow),
+        )
+
+    def _bfs_augment(self, s: int, t: int, parent_edge: array, q: array,
+                     path_edges: array) -> int:
+        """
+        BFS по резидуальному графу для пошуку найкоротшого доповнювального шляху s→t
+        і насичення знайденого шляху.
+
+        parent_edge[v] — ребро, яким пошук дійшов до v. Черга q — плаский масив з
+        індексами q_head/q_tail; буфери належать викликачеві й лише перезаповнюються
+        (без нових алокацій). Знайдений шлях записується в path_edges як список номерів
+        ребер, і вздовж нього одразу оновлюються залишкові ємності.
+        Повертає «bottleneck» (на стільки збільшився потік); 0 — шляху немає.
+        """
+        indptr, adj, head, cap = self._indptr, self._adj, self._head, self._cap
+
+        parent_edge[:] = self._unseen
+        parent_edge[s] = _ROOT
+
+        q[0] = s
+        q_head, q_tail = 0, 1
+
+        while q_head < q_tail and parent_edge[t] == _UNSEEN:
+            u = q[q_head]
+            q_head += 1
+            # розглядаємо ребра u→v з позитивною залишковою ємністю
+            for e in adj[indptr[u]:indptr[u + 1]]:
+                if cap[e] > 0:
+                    v = head[e]
+                    if parent_edge[v] == _UNSEEN:
+                        parent_edge[v] = e
+                        if v == t:  # дійшли до стоку — шлях знайдено
+                            break
+                        q[q_tail] = v
+                        q_tail += 1
+
+        if parent_edge[t] == _UNSEEN:
+            return 0
+
+        # збираємо ребра шляху в плаский буфер — далі і «вузьке місце»,
+        # і оновлення ємностей читають лише cap[e] без повторного проходу по батьках
+        length = 0
+        x = t
+        while x != s:
+            e = parent_edge[x]
+            path_edges[length] = e
+            length += 1
+            x = head[e ^ 1]
+
+        path = path_edges[:length]
+        bottleneck = min(map(cap.__getitem__, path))
+        for e in path:
+            self._push(e, bottleneck)
+        return bottleneck
+
+    def edmonds_karp(self, s: str, t: str) -> Tuple[int, EdgeFlows]:
         """
         Основний алгоритм: поки існує доповнювальний шлях — збільшуємо потік на його «bottleneck».
 
         Повертає:
             total_flow        — значення максимального потоку
-            flow_matrix[u][v] — фактичний потік, який пройшов по ребру u→v
-            residual          — фінальний резидуальний граф (після насичення)
+            flows             — фактичні потоки по ребрах (EdgeFlows)
         """
-        # 1) створюємо резидуальний граф
-        residual = self._build_residual()
+        # 1) готуємо резидуальний граф (CSR-масиви; ємності оновлюються на місці)
+        self._reset()
+        si, ti = self._ids[s], self._ids[t]
+
+        # робочі буфери BFS виділяються один раз на весь розрахунок
+        n = len(self._names)
+        parent_edge = array("i", self._unseen)
+        q = array("i", bytes(4 * n))
+        path_edges = array("i", bytes(4 * n))  # простий шлях має не більше n - 1 ребер
 
         total_flow = 0
 
         # 2) повторюємо пошук шляху і насичення
         while True:
-            res_path = self._bfs_augment(residual, s, t)
-            if res_path is None:  # шляхів більше немає — алгоритм завершується
+            aug = self._bfs_augment(si, ti, parent_edge, q, path_edges)
+            if aug == 0:  # шляхів більше немає — алгоритм завершується
                 break
-
-            aug = res_path.bottleneck
             total_flow += aug
 
-            # 3) йдемо назад по батьківському ланцюжку і оновлюємо залишкові ємності
-            v = t
-            while res_path.parent[v] is not None:
-                u = res_path.parent[v]  # тип: ignore
-                residual[u][v] -= aug          # витратили ємність на прямому ребрі
-                residual[v][u] += aug          # збільшили ємність зворотного ребра
-                v = u
+        # 3) Відновлюємо фактичні потоки із залишкових ємностей
+        return total_flow, self._flows()
+
+    # алгоритм Дініца
+
+    def _bfs_levels(self, s: int, t: int, level: array, q: array) -> bool:
+        """
+        BFS з s, що розмічає рівні вершин (відстань по ребрах з позитивною залишковою
+        ємністю) у буфері level. Повертає True, якщо t досяжна.
+        Черга — плаский буфер q на n елементів з курсорами q_head/q_tail: кожна вершина
+        потрапляє в неї не більше одного разу, тож перенесення по колу не потрібне.
+        """
+        indptr, adj, head, cap = self._indptr, self._adj, self._head, self._cap
+
+        level[:] = self._unseen
+        level[s] = 0
+        q[0] = s
+        q_head, q_tail = 0, 1
+
+        while q_head < q_tail:
+            u = q[q_head]
+            q_head += 1
+            for i in range(indptr[u], indptr[u + 1]):
+                e = adj[i]
+                v = head[e]
+                if level[v] == _UNSEEN and cap[e] > 0:
+                    level[v] = level[u] + 1
+                    if v == t:  # глибші рівні для цієї фази не потрібні
+                        return True
+                    q[q_tail] = v
+                    q_tail += 1
+
+        return False
+
+    def _dfs_blocking(self, s: int, t: int, level: array, it: array) -> int:
+        """
+        Ітеративний DFS по шаровому графу (лише ребра level[v] == level[u] + 1) — шукає
+        шлях s→t і проштовхує по ньому «вузьке місце». Ребра шляху лежать у явному стеку,
+        тож глибина графа не обмежена глибиною рекурсії Python.
+        it[u] вказує на перше ще не відкинуте ребро у списку суміжності u, тому «мертві»
+        ребра не переглядаються повторно в межах фази.
+        Повертає величину проштовхнутого потоку (0 — шляху більше немає).
+        """
+        indptr, adj, head, cap = self._indptr, self._adj, self._head, self._cap
+
+        stack: List[int] = []  # ребра поточного шляху з s
+        u = s
+        while u != t:
+            end = indptr[u + 1]
+            while it[u] < end:
+                e = adj[it[u]]
+                v = head[e]
+                if cap[e] > 0 and level[v] == level[u] + 1:
+                    stack.append(e)
+                    u = v
+                    break
+                it[u] += 1
+            else:
+                # з u до t не дійти — відступаємо і відкидаємо ребро, яким сюди прийшли
+                if not stack:
+                    return 0
+                e = stack.pop()
+                u = head[e ^ 1]
+                it[u] += 1
+
+        d = min(map(cap.__getitem__, stack))
+        for e in stack:
+            self._push(e, d)
+        return d
+
+    def dinic(self, s: str, t: str) -> Tuple[int, EdgeFlows]:
+        """
+        Алгоритм Дініца: у кожній фазі BFS будує шаровий граф, після чого DFS
+        проштовхує блокуючий потік. Для шарової мережі «термінали → склади → магазини»
+        фаз стільки, скільки різних довжин мають найкоротші шляхи, а не по одній
+        на кожен доповнювальний шлях, як у Едмондса–Карпа.
+
+        Повертає те саме, що й edmonds_karp.
+        """
+        self._reset()
+        si, ti = self._ids[s], self._ids[t]
+
+        n = len(self._names)
+        level = array("i", self._unseen)
+        it = array("i", bytes(4 * n))
+        q = array("i", bytes(4 * n))
+
+        total_flow = self._dinic_phases(si, ti, level, it, q)
+        return total_flow, self._flows()
 
-        # 4) Відновлюємо матрицю фактичних потоків з різниці «початкова ємність – залишкова»
-        flow_matrix: Dict[str, Dict[str, int]] = defaultdict(dict)
-        for u in self.graph:
-            for v in self.graph[u]:
-                cap0 = self.graph[u][v]         # початкова ємність ребра
-                cap_res = residual[u][v]        # те, що лишилося в резидуальному
-                used = cap0 - cap_res           # отже, стільки «пройшло»
-                flow_matrix[u][v] = used if used > 0 else 0
+    def _dinic_phases(self, s: int, t: int, level: array, it: array, q: array) -> int:
+        """Фази Дініца над поточними _cap (змінюються на місці). Повертає величину потоку."""
+        indptr = self._indptr
+        n = len(it)
 
-        return total_flow, flow_matrix, residual
+        total_flow = 0
+        while self._bfs_levels(s, t, level, q):
+            it[:] = indptr[:n]
+            while True:
+                pushed = self._dfs_blocking(s, t, level, it)
+                if pushed == 0:
+                    break
+                total_flow += pushed
+        return total_flow
+
+    # повторні розрахунки на незмінній топології
+
+    def capacities(self) -> array:
+        """Копія ємностей ребер у порядку їх першого додавання (add_edge/add_edges)."""
+        return array("i", self._edge_cap)
+
+    def specialize(self, s: str, t: str) -> Callable[[Sequence[int]], Tuple[int, array]]:
+        """
+        Готує розв'язувач для фіксованої мережі й фіксованої пари s→t.
+
+        CSR-масиви, номери s/t та робочі буфери обчислюються один раз і «запікаються»
+        в замикання, тож solve(capacities) лише записує нові ємності у cap і запускає
+        фази Дініца — без повторної побудови графа. Зручно для серій розрахунків,
+        наприклад аналізу чутливості максимального потоку до окремих ємностей.
+
+        solve приймає ємності в порядку capacities() і повертає
+        (значення максимального потоку, потоки по ребрах у тому самому порядку).
+        Після зміни набору ребер розв'язувач треба створити заново.
+        """
+        self._reset()
+        si, ti = self._ids[s], self._ids[t]
+
+        n = len(self._names)
+        m = len(self._edge_cap)
+        cap, flow = self._cap, self._flow
+        zeros = self._no_flow
+        level = array("i", self._unseen)
+        it = array("i", bytes(4 * n))
+        q = array("i", bytes(4 * n))
+
+        def solve(capacities: Sequence[int]) -> Tuple[int, array]:
+            if not self._compiled or cap is not self._cap:
+                raise RuntimeError("Набір ребер змінився — викличте specialize() ще раз")
+            if len(capacities) != m:
+                raise ValueError(f"Очікується {m} ємностей, отримано {len(capacities)}")
+            if min(capacities, default=0) < 0:
+                raise ValueError("Ємність ребра повинна бути невід'ємною")
+            if max(capacities, default=0) > _CAP_MAX:
+                raise ValueError(f"Ємність ребра не може перевищувати {_CAP_MAX}")
+
+            cap[0::2] = array("i", capacities)
+            cap[1::2] = zeros
+            flow[:] = zeros
+            total_flow = self._dinic_phases(si, ti, level, it, q)
+            return total_flow, array("i", flow)
+
+        return solve
+
+    # декомпозиція потоку
+
+    def decompose(self, s: str, t: str, flows: EdgeFlows) -> List[Tuple[List[str], int]]:
+        """
+        Цілочисельна декомпозиція потоку на шляхи s→t.
+
+        Поки з s виходить нерозкладений потік, DFS іде лише ребрами з rest[k] > 0 до t;
+        мінімум rest уздовж шляху — ціла кількість одиниць, що пройшла цим шляхом, і її
+        віднімаємо від усіх ребер шляху. Якщо DFS повертається у вершину поточного шляху,
+        знайдений цикл скасовується (на величину потоку s→t він не впливає).
+        it[u] — як у Дініца — вказує на перше ще не вичерпане ребро вершини u.
+
+        Повертає список (вершини шляху, кількість одиниць).
+        """
+        names, src, dst = flows.names, flows.src, flows.dst
+        n = len(names)
+        si, ti = self._ids[s], self._ids[t]
+
+        rest = array("i", flows.flow)  # ще не розкладений потік по ребрах
+        out: List[List[int]] = [[] for _ in range(n)]
+        for k, f in enumerate(rest):
+            if f > 0:
+                out[src[k]].append(k)
+        it = [0] * n
+        pos = [-1] * n  # кількість ребер від s до вершини на поточному шляху (-1 — не на шляху)
+
+        paths: List[Tuple[List[str], int]] = []
+        while True:
+            stack: List[int] = []  # ребра поточного шляху з s
+            pos[si] = 0
+            u = si
+            while u != ti:
+                edges_u = out[u]
+                while it[u] < len(edges_u) and rest[edges_u[it[u]]] == 0:
+                    it[u] += 1
+
+                if it[u] == len(edges_u):
+                    # з u потік більше не виходить
+                    pos[u] = -1
+                    if not stack:
+                        return paths
+                    k = stack.pop()
+                    u = src[k]
+                    it[u] += 1
+                    continue
+
+                k = edges_u[it[u]]
+                v = dst[k]
+                if pos[v] != -1:
+                    # цикл v → … → u → v: скасовуємо його і продовжуємо з v
+                    cycle = stack[pos[v]:]
+                    cycle.append(k)
+                    d = min(rest[e] for e in cycle)
+                    for e in cycle:
+                        rest[e] -= d
+                    for e in stack[pos[v]:]:
+                        pos[dst[e]] = -1
+                    del stack[pos[v]:]
+                    u = v
+                    continue
+
+                stack.append(k)
+                pos[v] = len(stack)
+                u = v
+
+            d = min(rest[k] for k in stack)
+            path = [s]
+            for k in stack:
+                rest[k] -= d
+                pos[dst[k]] = -1
+                path.append(names[dst[k]])
+            pos[si] = -1
+            paths.append((path, d))
 
 
 # Побудова мережі і запуск розрахунку
 
 def write_readme(max_flow_value: int,
-                 terminal_store_flow: Dict[str, Dict[str, float]]) -> None:
+                 terminals: List[str],
+                 flow_TM: List[List[int]]) -> None:
     """Сформувати детальний README.md з аналізом та відповідями на питання."""
 
-    # Підсумки за терміналами (з агрегованої таблиці T→M)
-    sum_by_terminal = {
-        t: round(sum(terminal_store_flow.get(t, {}).values()))
-        for t in sorted(terminal_store_flow)
-    }
+    # Підсумки за терміналами (суми рядків матриці T→M)
+    sum_by_terminal = {t: sum(row) for t, row in zip(terminals, flow_TM)}
     sums_line = ", ".join(f"{t}={v}" for t, v in sum_by_terminal.items())
 
     content = (
-        "# Логістична мережа: максимальний потік (Едмондс–Карп)\n\n"
+        "# Логістична мережа: максимальний потік (Дініц)\n\n"
         "## Ключові результати\n"
         f"- **Максимальний потік = {max_flow_value}** "
         "(дорівнює сумі вихідних ємностей терміналів: **T1 = 60**, **T2 = 55**).\n"
@@ -180,10 +539,13 @@ def write_readme(max_flow_value: int,
         "Вузли: термінали **T1,T2**, склади **S1..S4**, магазини **M1..M14**, "
         "джерело **SRC**, стік **SNK**. Ребра та ємності взято з умови.\n\n"
         "## Алгоритм\n"
-        "Використано **Едмондса–Карпа** (BFS у резидуальному графі). "
-        "Поки існує доповнювальний шлях `SRC→SNK`, потік збільшується на bottleneck; "
-        "залишкові ємності оновлюються. За теоремою мін–макс отриманий потік "
-        "дорівнює вазі мінімального розрізу.\n\n"
+        "Використано **алгоритм Дініца**. Кожна фаза будує BFS-ом шаровий граф "
+        "(відстані від `SRC` у резидуальній мережі), а потім DFS-ом знаходить у ньому "
+        "блокуючий потік, після чого залишкові ємності оновлюються. Фази тривають, поки "
+        "`SNK` досяжний із `SRC`. За теоремою мін–макс отриманий потік дорівнює вазі "
+        "мінімального розрізу. Реалізацію **Едмондса–Карпа** (BFS-пошук доповнювального "
+        "шляху й збільшення потоку на bottleneck) збережено для порівняння: вона дає "
+        "той самий максимум, але потребує більше BFS-проходів.\n\n"
         "## Інтерпретація (мін–макс)\n"
         "Оскільки **SRC→T1** і **SRC→T2** сумарно дають **115**, а нижні рівні мережі "
         "мають більші сумарні ємності, глобальний максимум дорівнює **115**. "
@@ -213,7 +575,6 @@ def build_and_run() -> int:
 
     # Вузли мережі
     terminals = ["T1", "T2"]
-    warehouses = ["S1", "S2", "S3", "S4"]
     stores = [f"M{i}" for i in range(1, 15)]
 
     # Ємності виходу з терміналів у «джерело → термінал».
@@ -238,83 +599,58 @@ def build_and_run() -> int:
     # --- Побудова графа ---
     mf = MaxFlow()
 
-    # SRC → термінали (задаємо загальну «пропозицію» кожного термінала)
-    for t in terminals:
-        mf.add_edge(SRC, t, out_T[t])
-
-    # термінали → склади
-    for (t, s), c in edges_T_S.items():
-        mf.add_edge(t, s, c)
-
-    # склади → магазини
-    for (s, m), c in edges_S_M.items():
-        mf.add_edge(s, m, c)
-
     # магазини → SNK (сток).
     # Якщо для магазину вхідних ребер кілька — сумуємо їх ємності.
     # Якщо магазин взагалі не має вхідних ребер (у нас таких немає) — можна
     # поставити «дуже великий» попит (щоб не обмежувати зверху).
-    for m in stores:
-        cap_in = sum(c for (s, mm), c in edges_S_M.items() if mm == m)
-        mf.add_edge(m, SNK, cap_in if cap_in > 0 else 10**9)
+    cap_in = dict.fromkeys(stores, 0)
+    for (s, m), c in edges_S_M.items():
+        cap_in[m] += c
+
+    # Усі ребра додаються одним пакетом:
+    # SRC → термінали (загальна «пропозиція» кожного термінала), термінали → склади,
+    # склади → магазини, магазини → SNK
+    mf.add_edges(chain(
+        ((SRC, t, out_T[t]) for t in terminals),
+        ((t, s, c) for (t, s), c in edges_T_S.items()),
+        ((s, m, c) for (s, m), c in edges_S_M.items()),
+        ((m, SNK, cap_in[m] if cap_in[m] > 0 else 10**9) for m in stores),
+    ))
 
     # --- Розрахунок максимального потоку ---
-    max_flow_value, flow_matrix, residual = mf.edmonds_karp(SRC, SNK)
+    max_flow_value, flows = mf.dinic(SRC, SNK)
 
     # -----------------------------------------------------------------------
     # Декомпозиція потоку за парами «Термінал → Магазин»
     # -----------------------------------------------------------------------
-    # Ідея: спершу дивимось, скільки фактично кожен термінал загнав у кожен склад,
-    # потім пропорційно цьому «розбиваємо» вихід складу на його магазини.
-
-    # 1) Вхід складу з терміналів (фактичні значення з flow_matrix)
-    in_T_to_S = defaultdict(lambda: defaultdict(int))  # S -> (T -> flow)
-    for (t, s), _ in edges_T_S.items():
-        in_T_to_S[s][t] = flow_matrix.get(t, {}).get(s, 0)
-
-    # Сумарний вхід складу (для нормування часток)
-    in_total_S = {s: sum(in_T_to_S[s].values()) for s in warehouses}
-
-    # 2) Вихід складу в магазини (фактичний потік)
-    out_S_to_M = defaultdict(lambda: defaultdict(int))  # S -> (M -> flow)
-    for (s, m), _ in edges_S_M.items():
-        out_S_to_M[s][m] = flow_matrix.get(s, {}).get(m, 0)
-
-    # 3) Формуємо таблицю «термінал → магазин» через пропорційний розподіл
-    terminal_store_flow = defaultdict(lambda: defaultdict(float))  # T -> (M -> flow)
-    for s in warehouses:
-        total_in = in_total_S.get(s, 0)
-        if total_in == 0:  # склад порожній — пропускаємо
-            continue
-
-        # частки внеску терміналів у потік, що увійшов у склад s
-        shares = {t: in_T_to_S[s].get(t, 0) / total_in for t in terminals}
-
-        # пропорційно shares розкладаємо потік складу на магазини
-        for m, flow_sm in out_S_to_M[s].items():
-            if flow_sm == 0:
-                continue
-            for t, sh in shares.items():
-                terminal_store_flow[t][m] += flow_sm * sh
+    # Ідея: розкладаємо максимальний потік на цілочисельні шляхи SRC → T → S → M → SNK;
+    # кожен шлях точно каже, скільки одиниць термінал T доставив у магазин M.
+    # Сума по всіх шляхах дорівнює max_flow_value, тож округлення не потрібні.
+    # Результат — щільна матриця flow_TM[i][j]: потік від terminals[i] до stores[j].
+    t_index = {t: i for i, t in enumerate(terminals)}
+    m_index = {m: j for j, m in enumerate(stores)}
+    flow_TM = [[0] * len(stores) for _ in terminals]
+    for path, amount in mf.decompose(SRC, SNK, flows):
+        flow_TM[t_index[path[1]]][m_index[path[-2]]] += amount
 
     # -----------------------------------------------------------------------
     # Збереження результатів
     # -----------------------------------------------------------------------
     # CSV з таблицею «Термінал, Магазин, Фактичний потік»
-    rows: List[List[object]] = []
-    for t, row in terminal_store_flow.items():
-        for m, v in row.items():
-            if v > 0:
-                rows.append([t, m, round(v)])
-    rows.sort(key=lambda r: (r[0], int(r[1][1:])))  # групуємо за терміналом, потім M1..M14
-
+    # Порядок рядків і стовпців flow_TM уже відповідає T1, T2 і M1..M14,
+    # тож обхід матриці дає рядки, згруповані за терміналом, без сортування.
     with open("flows_terminal_store.csv", "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow(["Термінал", "Магазин", "Фактичний потік (од.)"])
-        w.writerows(rows)
+        w.writerows(
+            (t, m, v)
+            for t, row in zip(terminals, flow_TM)
+            for m, v in zip(stores, row)
+            if v > 0
+        )
 
     # Генерую README з аналізом
-    write_readme(max_flow_value, terminal_store_flow)
+    write_readme(max_flow_value, terminals, flow_TM)
 
     print(f"Максимальний потік: {max_flow_value}")
     return max_flow_value
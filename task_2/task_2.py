@@ -2,23 +2,32 @@
 # 
 # Пояснення реалізації:
 #   - has_prefix(prefix): проходжу символи префікса; якщо шлях існує — повертаю True,
-#      якщо поточний вузол вже завершує слово, або якщо в піддереві є хоча б одне термінальне слово.
-#   - count_words_with_suffix(pattern): один глибинний обхід усього дерева; тримаю ковзне вікно останніх k=len(pattern) символів 
-#       у deque(maxlen=k) та інкрементую лічильник кожного разу, коли зустрічаю кінець слова і вікно дорівнює pattern. 
-#       Так не будуються всі рядки цілком і не колекціонуються всі ключі, що краще для великих наборів.
+#      якщо поточний вузол вже завершує слово, або якщо його лічильник descendant_terminals > 0
+#      (put/delete підтримують його актуальним, тож обхід піддерева не потрібен).
+#   - count_words_with_suffix(pattern): якщо плаский буфер усіх слів уже побудований
+#       (Trie._materialize, кешується до put/delete), перевіряю кінець кожного слова через
+#       buf.startswith(pattern, start, end) — порівняння на рівні C без нових рядків.
+#       Інакше — один глибинний обхід дерева, де кожен виклик отримує вже складений рядок шляху,
+#       і на кінці слова перевіряю key.endswith(pattern); другої копії слів при цьому не створюю.
+#   - count_words_with_suffixes(patterns): пакетний варіант для незмінного словника; будує плаский
+#       буфер (друга копія всіх слів у пам'яті) і для кожної довжини k один раз рахує Counter
+#       останніх k символів усіх слів, після чого кожен запит — O(1).
 
 
-from collections import deque
+from collections import Counter
+
 from trie import Trie
 
 
+
 class Homework(Trie):
     def count_words_with_suffix(self, pattern) -> int:
         """
         Повертає кількість слів у Trie, що закінчуються на pattern.
         - Враховує регістр.
         - Якщо pattern == "", повертає загальну кількість слів.
-        Реалізація: один DFS по дереву з ковзним вікном останніх k символів.
+        Реалізація: плаский прохід по кінцях слів, якщо буфер слів уже в кеші
+        (див. _count_suffix_flat), інакше DFS по дереву (див. _count_suffix_dfs).
         """
         if not isinstance(pattern, str):
             raise TypeError("pattern must be a string")
@@ -26,33 +35,63 @@ class Homework(Trie):
         if pattern == "":
             return self.size  # порожній суфікс підходить будь-якому слову
 
-        k = len(pattern)
-        target = pattern
+        if self._flat is not None:
+            return self._count_suffix_flat(pattern)
+        return self._count_suffix_dfs(pattern)
+
+    def _count_suffix_dfs(self, pattern) -> int:
         cnt = 0
-        window = deque(maxlen=k)  # автоматично викидає зліва, коли довжина > k
 
-        def dfs(node):
+        def dfs(node, key):
             nonlocal cnt
-            # Якщо це кінець слова — перевіряємо, чи вікно дорівнює суфіксу
-            if node.value is not None and len(window) == k and "".join(window) == target:
+            # Якщо це кінець слова — перевіряємо, чи рядок шляху закінчується суфіксом
+            if node.value is not None and key.endswith(pattern):
                 cnt += 1
-            # Обхід дітей
             for ch, nxt in node.children.items():
-                before = len(window)
-                window.append(ch)
-                dfs(nxt)
-                # Відкочуємо лише те, що додали на цьому рівні
-                if len(window) > before:
-                    window.pop()
-
-        dfs(self.root)
+                dfs(nxt, key + ch)
+
+        dfs(self.root, "")
+        return cnt
+
+    def _count_suffix_flat(self, pattern) -> int:
+        buf, starts, lens = self._materialize()
+        k = len(pattern)
+        cnt = 0
+        for start, n in zip(starts, lens):
+            # n >= k: інакше діапазон порівняння зачепив би попереднє слово в buf
+            if n >= k and buf.startswith(pattern, start + n - k, start + n):
+                cnt += 1
         return cnt
 
+    def count_words_with_suffixes(self, patterns) -> list[int]:
+        """
+        Пакетний варіант count_words_with_suffix для багатьох запитів до незмінного словника.
+        Для кожної довжини суфікса один раз будується Counter останніх k символів усіх слів,
+        тож кожен запит далі — одне звернення до словника. Побудований буфер слів лишається
+        в кеші до наступного put/delete, і до того часу count_words_with_suffix теж бере його.
+        """
+        buf, starts, lens = self._materialize()
+        by_len = {}  # k -> Counter(суфікс довжини k -> кількість слів)
+        res = []
+        for pattern in patterns:
+            if not isinstance(pattern, str):
+                raise TypeError("pattern must be a string")
+            if pattern == "":
+                res.append(self.size)
+                continue
+            k = len(pattern)
+            if k not in by_len:
+                by_len[k] = Counter(
+                    buf[start + n - k:start + n] for start, n in zip(starts, lens) if n >= k
+                )
+            res.append(by_len[k][pattern])
+        return res
+
     def has_prefix(self, prefix) -> bool:
         """
         True, якщо існує хоч одне слово з префіксом prefix; інакше False.
         Кроки: йдемо по символах; якщо шлях є — перевіряємо, чи поточний вузол
-        вже кінець слова або в піддереві існує термінальний вузол.
+        вже кінець слова або під ним є хоча б одне слово (O(|prefix|)).
         """
         if not isinstance(prefix, str):
             raise TypeError("prefix must be a string")
@@ -63,17 +102,7 @@ class Homework(Trie):
                 return False
             cur = cur.children[ch]
 
-        if cur.value is not None:
-            return True
-
-        # шукаємо будь-який термінальний вузол у піддереві
-        stack = [cur]
-        while stack:
-            node = stack.pop()
-            if node.value is not None:
-                return True
-            stack.extend(node.children.values())
-        return False
+        return cur.value is not None or cur.descendant_terminals > 0
 
 
 if __name__ == "__main__":
@@ -88,10 +117,28 @@ if __name__ == "__main__":
     assert trie.count_words_with_suffix("a") == 1  # banana
     assert trie.count_words_with_suffix("at") == 1  # cat
 
+    # Після пакетного запиту буфер слів у кеші, і одиничні запити йдуть пласким проходом —
+    # відповіді ті самі, що й у DFS
+    suffixes = ["e", "ion", "a", "at", "n", "x", "apple", "applex"]
+    by_dfs = [trie.count_words_with_suffix(suffix) for suffix in suffixes]
+    assert trie.count_words_with_suffixes(["e", "ion", "a", "at", "x"]) == [1, 1, 1, 1, 0]
+    assert trie._flat is not None
+    assert [trie.count_words_with_suffix(suffix) for suffix in suffixes] == by_dfs
+
     # Перевірка наявності префікса
     assert trie.has_prefix("app") is True  # apple, application
     assert trie.has_prefix("bat") is False
     assert trie.has_prefix("ban") is True  # banana
     assert trie.has_prefix("ca") is True  # cat
 
+    # Пакетна вставка дає ті самі слова й відповіді, що й послідовні put,
+    # але нові ключі йдуть у лексикографічному порядку
+    bulk = Homework()
+    bulk.put_many((word, i) for i, word in enumerate(words))
+    assert sorted(bulk.keys()) == sorted(trie.keys()) and bulk.size == trie.size
+    assert bulk.has_prefix("app") is True and bulk.count_words_with_suffix("ion") == 1
+    ordered = Homework()
+    ordered.put_many([("b", 1), ("a", 2)])
+    assert ordered.keys() == ["a", "b"]
+
     print("All checks passed.")
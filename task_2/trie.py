@@ -1,27 +1,102 @@
 # trie.py — базова реалізація Trie
 
+from array import array
+from operator import itemgetter
+
+
 class TrieNode:
     def __init__(self):
         self.children = {}     # char -> TrieNode
         self.value = None      # маркер завершення слова (може зберігати payload)
+        self.descendant_terminals = 0  # кількість слів, що закінчуються строго нижче цього вузла
 
 class Trie:
     def __init__(self):
         self.root = TrieNode()
         self.size = 0          # кількість слів у дереві
+        self._flat = None      # кеш плаского списку слів (див. _materialize)
 
     # вставка
     def put(self, key, value=None):
         if not isinstance(key, str) or not key:
             raise TypeError(f"Illegal argument for put: key = {key} must be a non-empty string")
         cur = self.root
+        path = []
         for ch in key:
+            path.append(cur)
             if ch not in cur.children:
                 cur.children[ch] = TrieNode()
             cur = cur.children[ch]
         if cur.value is None:
             self.size += 1
+        # вузол став (або перестав бути) кінцем слова — оновлюємо лічильники предків
+        delta = (value is not None) - (cur.value is not None)
+        if delta:
+            for node in path:
+                node.descendant_terminals += delta
         cur.value = value
+        self._reset_caches()
+
+    # пакетна вставка
+    def put_many(self, items):
+        """
+        Вставляє пари (key, value), спершу відсортувавши їх за ключем: спуск для кожного
+        ключа починається не з кореня, а з вузла на глибині спільного префікса з попереднім.
+        path[d] — вузол на глибині d для попереднього ключа; pending[d] — нові слова під
+        path[d], ще не внесені в його descendant_terminals (вносяться, коли вузол знімається
+        зі шляху), тож спільний префікс не проходиться повторно і для лічильників.
+        На відміну від послідовних put, нові діти створюються в порядку сортування, тож
+        keys()/keys_with_prefix() повертають нові ключі у лексикографічному порядку:
+        put_many([("b", 1), ("a", 2)]) дає keys() == ["a", "b"], а put("b", 1); put("a", 2)
+        дає ["b", "a"]. Значення, size і відповіді інших запитів збігаються.
+        """
+        items = list(items)
+        for key, _ in items:
+            if not isinstance(key, str) or not key:
+                raise TypeError(
+                    f"Illegal argument for put_many: key = {key} must be a non-empty string"
+                )
+        # стабільне сортування: для однакових ключів перемагає останнє значення
+        items.sort(key=itemgetter(0))
+
+        path = [self.root]
+        pending = [0]
+        prev = ""
+        for key, value in items:
+            lcp = 0
+            limit = min(len(prev), len(key))
+            while lcp < limit and prev[lcp] == key[lcp]:
+                lcp += 1
+            # знімаємо зі шляху вузли глибше за спільний префікс, передаючи лічильники вгору
+            while len(path) > lcp + 1:
+                node = path.pop()
+                cnt = pending.pop()
+                if cnt:
+                    node.descendant_terminals += cnt
+                    pending[-1] += cnt
+
+            cur = path[-1]
+            for ch in key[lcp:]:
+                nxt = cur.children.get(ch)
+                if nxt is None:
+                    nxt = cur.children[ch] = TrieNode()
+                cur = nxt
+                path.append(cur)
+                pending.append(0)
+
+            if cur.value is None:
+                self.size += 1
+            pending[-2] += (value is not None) - (cur.value is not None)
+            cur.value = value
+            prev = key
+
+        while len(path) > 1:
+            node = path.pop()
+            cnt = pending.pop()
+            node.descendant_terminals += cnt
+            pending[-1] += cnt
+        self.root.descendant_terminals += pending[0]
+        self._reset_caches()
 
     # пошук точного слова
     def get(self, key):
@@ -52,7 +127,39 @@ class Trie:
                 return len(node.children) == 0 and node.value is None
             return False
 
+        before = self.size
         _del(self.root, key, 0)
+        if self.size < before:
+            # слово видалено — зменшуємо лічильники предків, що лишилися після обрізання гілки
+            cur = self.root
+            for ch in key:
+                cur.descendant_terminals -= 1
+                cur = cur.children.get(ch)
+                if cur is None:
+                    break
+        self._reset_caches()
+
+    def _materialize(self):
+        """
+        Усі слова одним рядком buf і паралельні масиви starts/lens:
+        i-те слово — buf[starts[i]:starts[i] + lens[i]].
+        Запити по кінцях слів зводяться до порівнянь усередині buf без обходу дерева.
+        Результат кешується до наступного put/delete.
+        """
+        if self._flat is None:
+            words = self.keys()
+            starts = array("i")
+            lens = array("i")
+            pos = 0
+            for w in words:
+                starts.append(pos)
+                lens.append(len(w))
+                pos += len(w)
+            self._flat = ("".join(words), starts, lens)
+        return self._flat
+
+    def _reset_caches(self):
+        self._flat = None
 
     def is_empty(self):
         return self.size == 0
@@ -84,19 +191,18 @@ class Trie:
                 return []
             cur = cur.children[ch]
         res = []
-        self._collect(cur, list(prefix), res)
+        self._collect(cur, prefix, res)
         return res
 
-    def _collect(self, node, path, out):
+    def _collect(self, node, key, out):
+        # key — уже побудований рядок шляху до node: кожен ключ — одна конкатенація, без join
         if node.value is not None:
-            out.append("".join(path))
+            out.append(key)
         for ch, nxt in node.children.items():
-            path.append(ch)
-            self._collect(nxt, path, out)
-            path.pop()
+            self._collect(nxt, key + ch, out)
 
     # всі ключі
     def keys(self):
         res = []
-        self._collect(self.root, [], res)
+        self._collect(self.root, "", res)
         return res